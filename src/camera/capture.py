@@ -6,13 +6,35 @@ import cv2
 class Camera:
     """Webcam capture handler."""
 
-    def __init__(self, camera_id: int = 0):
+    def __init__(
+        self,
+        camera_id: int = 0,
+        width: int = 640,
+        height: int = 360,
+        fps: int = 30,
+        fourcc: str = "MJPG",
+    ):
         self.camera_id = camera_id
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
         self.cap = None
 
     def start(self) -> bool:
         self.cap = cv2.VideoCapture(self.camera_id)
-        return self.cap.isOpened()
+        if not self.cap.isOpened():
+            return False
+        # Keep a single queued frame so reads never lag behind the sensor
+        if not self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            print("Warning: camera backend ignored CAP_PROP_BUFFERSIZE, frames may lag")
+        # Request a small MJPEG stream; backends fall back to the nearest mode
+        if self.fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        return True
 
     def read_frame(self, mirror: bool = True):
         if self.cap is None:
@@ -22,6 +44,21 @@ class Camera:
             frame = cv2.flip(frame, 1)
         return success, frame
 
+    def grab(self) -> bool:
+        """Advance to the next frame without decoding it."""
+        if self.cap is None:
+            return False
+        return self.cap.grab()
+
+    def retrieve(self, mirror: bool = True):
+        """Decode the most recently grabbed frame."""
+        if self.cap is None:
+            return False, None
+        success, frame = self.cap.retrieve()
+        if success and mirror:
+            frame = cv2.flip(frame, 1)
+        return success, frame
+
     def stop(self):
         if self.cap is not None:
             self.cap.release()
@@ -13,10 +13,11 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from ursina import *
 from direct.actor.Actor import Actor
-from panda3d.core import Material, LColor, Texture as P3DTexture
+from panda3d.core import Material, LColor, TextureStage, Texture as P3DTexture
 import cv2
+import numpy as np
 import threading
-import queue
+from collections import deque
 
 application.asset_folder = PROJECT_ROOT
 
@@ -59,6 +60,7 @@ class ActionCard(Entity):
         self.is_active = False
         self.target_scale = 1.0
         self.current_scale = 1.0
+        self._anim_dirty = False
         self.accent_color = accent_color
 
         # Card dimensions
@@ -110,6 +112,7 @@ class ActionCard(Entity):
             return
         self.is_active = active
         self.target_scale = 1.06 if active else 1.0
+        self._anim_dirty = True
 
         if active:
             self.accent_bar.color = self.accent_color
@@ -125,17 +128,42 @@ class ActionCard(Entity):
             self.bg.color = UIColors.PANEL_BG
 
     def update(self):
-        """Smooth scale animation."""
+        """Smooth scale animation, idle once the target scale is reached."""
+        if not self._anim_dirty:
+            return
         if abs(self.current_scale - self.target_scale) > 0.001:
             self.current_scale = lerp(
                 self.current_scale, self.target_scale, time.dt * 12
             )
-            self.scale = self.current_scale
+        else:
+            self.current_scale = self.target_scale
+            self._anim_dirty = False
+        self.scale = self.current_scale
 
 
 class DetectionStatusPanel(Entity):
     """Panel showing current detection status, gesture, and confidence."""
 
+    ACTION_NAMES = {
+        "idle": "Idle",
+        "boxing": "Boxing",
+        "dance": "Dancing",
+        "punch_left": "Left Punch",
+        "punch_right": "Right Punch",
+        "kick_left": "Left Kick",
+        "kick_right": "Right Kick",
+    }
+
+    ACTION_COLORS = {
+        "idle": UIColors.TEXT_MUTED,
+        "boxing": UIColors.ACCENT_RED,
+        "dance": UIColors.ACCENT_PURPLE,
+        "punch_left": UIColors.ACCENT_ORANGE,
+        "punch_right": UIColors.ACCENT_ORANGE,
+        "kick_left": UIColors.ACCENT_CYAN,
+        "kick_right": UIColors.ACCENT_CYAN,
+    }
+
     def __init__(self, position=(0, 0), **kwargs):
         super().__init__(parent=camera.ui, position=position, **kwargs)
 
@@ -239,59 +267,54 @@ class DetectionStatusPanel(Entity):
             color=UIColors.TEXT_SECONDARY,
         )
 
+        # Last values written, so update_status can skip unchanged labels
+        self._last_gestures = None
+        self._last_action = None
+        self._last_conf_pct = None
+
     def update_status(self, left_gesture, right_gesture, action, confidence):
-        """Update the detection status display."""
+        """Update the detection status display, writing only values that changed."""
         # Format gesture display
-        if left_gesture == "none" and right_gesture == "none":
-            gesture_str = "No hands detected"
-            self.gesture_value.color = UIColors.TEXT_MUTED
-        else:
-            parts = []
-            if left_gesture != "none":
-                parts.append(f"L: {left_gesture.title()}")
-            if right_gesture != "none":
-                parts.append(f"R: {right_gesture.title()}")
-            gesture_str = " | ".join(parts)
-            self.gesture_value.color = UIColors.TEXT_PRIMARY
+        if (left_gesture, right_gesture) != self._last_gestures:
+            self._last_gestures = (left_gesture, right_gesture)
+            if left_gesture == "none" and right_gesture == "none":
+                gesture_str = "No hands detected"
+                self.gesture_value.color = UIColors.TEXT_MUTED
+            else:
+                parts = []
+                if left_gesture != "none":
+                    parts.append(f"L: {left_gesture.title()}")
+                if right_gesture != "none":
+                    parts.append(f"R: {right_gesture.title()}")
+                gesture_str = " | ".join(parts)
+                self.gesture_value.color = UIColors.TEXT_PRIMARY
 
-        self.gesture_value.text = gesture_str
+            self.gesture_value.text = gesture_str
 
         # Format action display
-        action_names = {
-            "idle": "Idle",
-            "boxing": "Boxing",
-            "dance": "Dancing",
-            "punch_left": "Left Punch",
-            "punch_right": "Right Punch",
-            "kick_left": "Left Kick",
-            "kick_right": "Right Kick",
-        }
-        self.action_value.text = action_names.get(action, action.title())
-
-        # Color code action
-        action_colors = {
-            "idle": UIColors.TEXT_MUTED,
-            "boxing": UIColors.ACCENT_RED,
-            "dance": UIColors.ACCENT_PURPLE,
-            "punch_left": UIColors.ACCENT_ORANGE,
-            "punch_right": UIColors.ACCENT_ORANGE,
-            "kick_left": UIColors.ACCENT_CYAN,
-            "kick_right": UIColors.ACCENT_CYAN,
-        }
-        self.action_value.color = action_colors.get(action, UIColors.ACCENT_BLUE)
-
-        # Update confidence bar
-        conf_pct = confidence * 100
-        self.conf_bar_fill.scale_x = self.conf_bar_width * confidence
-        self.conf_text.text = f"{conf_pct:.0f}%"
-
-        # Color confidence bar based on level
-        if confidence > 0.8:
-            self.conf_bar_fill.color = UIColors.ACCENT_GREEN
-        elif confidence > 0.5:
-            self.conf_bar_fill.color = UIColors.ACCENT_YELLOW
-        else:
-            self.conf_bar_fill.color = UIColors.ACCENT_RED
+        if action != self._last_action:
+            self._last_action = action
+            self.action_value.text = self.ACTION_NAMES.get(action, action.title())
+            # Color code action
+            self.action_value.color = self.ACTION_COLORS.get(
+                action, UIColors.ACCENT_BLUE
+            )
+
+        # Update confidence bar, bucketed to whole percent so tiny changes
+        # don't rebuild the text node
+        conf_pct = round(confidence * 100)
+        if conf_pct != self._last_conf_pct:
+            self._last_conf_pct = conf_pct
+            self.conf_bar_fill.scale_x = self.conf_bar_width * conf_pct / 100
+            self.conf_text.text = f"{conf_pct}%"
+
+            # Color confidence bar based on level
+            if conf_pct > 80:
+                self.conf_bar_fill.color = UIColors.ACCENT_GREEN
+            elif conf_pct > 50:
+                self.conf_bar_fill.color = UIColors.ACCENT_YELLOW
+            else:
+                self.conf_bar_fill.color = UIColors.ACCENT_RED
 
 
 class GestureUI:
@@ -370,96 +393,200 @@ class GestureUI:
 class GestureController:
     """Handles webcam capture and gesture detection in a background thread."""
 
-    def __init__(self):
+    # Minimum spacing between MediaPipe runs, relaxed once the pose has held
+    # steady; frames in between reuse the previous results
+    INFER_INTERVAL = 1 / 15
+    STABLE_INFER_INTERVAL = 1 / 10
+    STABLE_POSE_FRAMES = 15
+
+    # Map gestures to animations (intuitive mappings):
+    # (left gesture, right gesture) -> (pose, confidence), anything else is idle
+    POSE_MAP = {
+        # Both hands matching = high confidence
+        ("fist", "fist"): ("boxing", 1.0),
+        ("open", "open"): ("dance", 1.0),
+        # Single hand fist = punch that side
+        ("fist", "none"): ("punch_left", 0.85),
+        ("fist", "open"): ("punch_left", 0.85),
+        ("none", "fist"): ("punch_right", 0.85),
+        ("open", "fist"): ("punch_right", 0.85),
+        # Single hand open = kick that side
+        ("open", "none"): ("kick_left", 0.85),
+        ("none", "open"): ("kick_right", 0.85),
+    }
+
+    def __init__(self, pin_threads=False):
         from src.camera.capture import Camera
         from src.tracking.hands import HandTracker
         from src.tracking.gestures import GestureDetector
 
         self.camera = Camera()
+        # Built before any pinning so MediaPipe's own thread pool keeps the
+        # full CPU mask
         self.tracker = HandTracker(max_hands=2)
         self.detector = GestureDetector()
         self.running = False
-        self.gesture_queue = queue.Queue()
-        self.frame_queue = queue.Queue(maxsize=2)
+        # Single-slot handoff to the render thread; appending drops the old value
+        self.gesture_slot = deque(maxlen=1)
+        self.frame_slot = deque(maxlen=1)
+        self._capture_cond = threading.Condition()
+        self._captured_frame = None
+        self._frame_wanted = threading.Event()
+        # Last gesture handed to the render thread; cleared to force a resend
+        self._published_gesture = None
+        self.pin_threads = pin_threads
+        self._worker_cpus = None
+        self._saved_cpus = None
+        self.capture_thread = None
         self.thread = None
 
     def start(self):
         if not self.camera.start():
             return False
         self.running = True
+        if self.pin_threads:
+            self._reserve_worker_core()
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
         self.thread = threading.Thread(target=self._process_loop, daemon=True)
+        self.capture_thread.start()
         self.thread.start()
         return True
 
+    @staticmethod
+    def _parse_cpu_list(text):
+        """Parse a sysfs CPU list such as "0-3,8" into a set of CPU ids."""
+        cpus = set()
+        for part in text.strip().split(","):
+            if not part:
+                continue
+            first, _, last = part.partition("-")
+            cpus.update(range(int(first), int(last or first) + 1))
+        return cpus
+
+    def _pick_worker_core(self, cpus):
+        """Pick a whole physical core, preferring the fastest ones (P-cores)."""
+        cores = {}
+        for cpu in cpus:
+            base = Path(f"/sys/devices/system/cpu/cpu{cpu}")
+            try:
+                siblings = (base / "topology/thread_siblings_list").read_text()
+            except OSError:
+                return None
+            try:
+                max_freq = int((base / "cpufreq/cpuinfo_max_freq").read_text())
+            except (OSError, ValueError):
+                max_freq = 0
+            core = frozenset(self._parse_cpu_list(siblings))
+            if core <= cpus:
+                cores[core] = max_freq
+        if not cores:
+            return None
+        fastest = max(cores.values())
+        return max(
+            (core for core, freq in cores.items() if freq == fastest), key=min
+        )
+
+    def _reserve_worker_core(self):
+        """Keep the render thread off one physical core reserved for the workers."""
+        if not hasattr(os, "sched_setaffinity"):
+            return
+        cpus = os.sched_getaffinity(0)
+        core = self._pick_worker_core(cpus)
+        if core is None or len(cpus - core) < 2:
+            return
+        try:
+            os.sched_setaffinity(0, cpus - core)
+        except OSError as e:
+            print(f"Could not reserve a core for gesture tracking: {e}")
+            return
+        self._saved_cpus = cpus
+        self._worker_cpus = core
+
+    def _pin_current_thread(self):
+        if not self._worker_cpus:
+            return
+        try:
+            os.sched_setaffinity(0, self._worker_cpus)
+        except OSError as e:
+            print(f"Could not pin worker thread: {e}")
+
     def stop(self):
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=1.0)
+        with self._capture_cond:
+            self._capture_cond.notify_all()
+        for thread in (self.capture_thread, self.thread):
+            if thread:
+                thread.join(timeout=1.0)
         self.tracker.close()
         self.camera.stop()
+        if self._saved_cpus:
+            try:
+                os.sched_setaffinity(0, self._saved_cpus)
+            except OSError as e:
+                print(f"Could not restore CPU affinity: {e}")
+            self._saved_cpus = None
+
+    def _capture_loop(self):
+        """Grab every frame but decode only when the inference thread asks."""
+        self._pin_current_thread()
+        while self.running:
+            if not self.camera.grab() or not self._frame_wanted.is_set():
+                continue
+            success, frame = self.camera.retrieve()
+            if not success:
+                continue
+            with self._capture_cond:
+                self._frame_wanted.clear()
+                self._captured_frame = frame
+                self._capture_cond.notify()
+
+    def _next_frame(self):
+        """Request a frame from the capture thread and wait for it."""
+        with self._capture_cond:
+            self._frame_wanted.set()
+            while self._captured_frame is None and self.running:
+                self._capture_cond.wait(timeout=0.1)
+            frame, self._captured_frame = self._captured_frame, None
+        return frame
 
     def _process_loop(self):
+        self._pin_current_thread()
+        last_infer = float("-inf")
+        last_pose = None
+        stable_frames = 0
         while self.running:
-            success, frame = self.camera.read_frame()
-            if not success:
+            frame = self._next_frame()
+            if frame is None:
                 continue
 
-            results = self.tracker.process_frame(frame)
-            all_landmarks = self.tracker.get_landmarks(results)
+            now = time.monotonic()
+            if stable_frames >= self.STABLE_POSE_FRAMES:
+                interval = self.STABLE_INFER_INTERVAL
+            else:
+                interval = self.INFER_INTERVAL
+            if now - last_infer >= interval:
+                results, all_landmarks = self.tracker.process_frame(frame)
+                last_infer = now
             handedness = self.tracker.get_handedness(results)
 
             left_gesture = right_gesture = "none"
-            confidence = 0.0
-            gesture_count = 0
-
             for i, landmarks in enumerate(all_landmarks):
                 hand_label = handedness[i] if i < len(handedness) else "Unknown"
-                gesture = self.detector.detect_gesture(landmarks)
                 if hand_label == "Left":
-                    left_gesture = gesture
-                    if gesture != "none":
-                        confidence += 1.0
-                        gesture_count += 1
+                    left_gesture = self.detector.detect_gesture(landmarks)
                 elif hand_label == "Right":
-                    right_gesture = gesture
-                    if gesture != "none":
-                        confidence += 1.0
-                        gesture_count += 1
-
-            # Calculate confidence based on clear gesture detection
-            if gesture_count > 0:
-                confidence = confidence / gesture_count
-            elif len(all_landmarks) > 0:
-                # Hands detected but no clear gesture
-                confidence = 0.5
-            else:
-                confidence = 0.0
-
-            # Map gestures to animations (intuitive mappings)
-            if left_gesture == "fist" and right_gesture == "fist":
-                pose = "boxing"
-                confidence = 1.0  # Both hands matching = high confidence
-            elif left_gesture == "open" and right_gesture == "open":
-                pose = "dance"
-                confidence = 1.0
-            # Single hand fist = punch that side
-            elif left_gesture == "fist":
-                pose = "punch_left"
-                confidence = 0.85
-            elif right_gesture == "fist":
-                pose = "punch_right"
-                confidence = 0.85
-            # Single hand open = kick that side
-            elif left_gesture == "open":
-                pose = "kick_left"
-                confidence = 0.85
-            elif right_gesture == "open":
-                pose = "kick_right"
-                confidence = 0.85
+                    right_gesture = self.detector.detect_gesture(landmarks)
+
+            mapped = self.POSE_MAP.get((left_gesture, right_gesture))
+            if mapped:
+                pose, confidence = mapped
             else:
                 pose = "idle"
                 confidence = 0.0 if len(all_landmarks) == 0 else 0.3
 
+            stable_frames = stable_frames + 1 if pose == last_pose else 0
+            last_pose = pose
+
             # Pack all data into a dict for the UI
             gesture_data = {
                 "pose": pose,
@@ -468,37 +595,56 @@ class GestureController:
                 "confidence": confidence,
             }
 
-            try:
-                self.gesture_queue.put_nowait(gesture_data)
-            except queue.Full:
-                pass
+            # Only publish changes so the render thread has nothing to do
+            # while the gesture holds
+            if gesture_data != self._published_gesture:
+                self.gesture_slot.append(gesture_data)
+                self._published_gesture = gesture_data
 
-            frame_with_landmarks = self.tracker.draw_landmarks(frame.copy(), results)
-            try:
-                while not self.frame_queue.empty():
-                    try:
-                        self.frame_queue.get_nowait()
-                    except queue.Empty:
-                        break
-                self.frame_queue.put_nowait(frame_with_landmarks)
-            except queue.Full:
-                pass
+            frame_with_landmarks = self.tracker.draw_landmarks(
+                frame, results, all_landmarks
+            )
+            self.frame_slot.append(frame_with_landmarks)
+
+    def republish_gesture(self):
+        """Resend the next detection even if it matches the last one published."""
+        self._published_gesture = None
 
     def get_latest_gesture_data(self):
         """Get the latest gesture data dict with pose, gestures, and confidence."""
-        data = None
-        while not self.gesture_queue.empty():
-            try:
-                data = self.gesture_queue.get_nowait()
-            except queue.Empty:
-                break
-        return data
+        # Only the render thread pops, so checking first cannot race
+        if self.gesture_slot:
+            return self.gesture_slot.pop()
+        return None
 
     def get_latest_frame(self):
-        try:
-            return self.frame_queue.get_nowait()
-        except queue.Empty:
-            return None
+        if self.frame_slot:
+            return self.frame_slot.pop()
+        return None
+
+
+ANIMATION_FILES = {
+    "idle": str(MODELS_PATH / "robot-default.glb"),
+    "dance": str(MODELS_PATH / "robot-dance.glb"),
+    "punch_left": str(MODELS_PATH / "robot-punch-left.glb"),
+    "punch_right": str(MODELS_PATH / "robot-punch-right.glb"),
+    "kick_left": str(MODELS_PATH / "robot-left-kick.glb"),
+    "kick_right": str(MODELS_PATH / "robot-right-kick.glb"),
+    "boxing": str(MODELS_PATH / "robot-boxing.glb"),
+}
+
+# Height zones: 0=feet, 1=head (Z range: 0.1 to 23.5)
+MATERIAL_ZONES = (
+    (0.92, "yellow"),  # Head top
+    (0.82, "white"),  # Head
+    (0.72, "blue"),  # Chest
+    (0.58, "white"),  # Abdomen
+    (0.45, "gray"),  # Waist
+    (0.22, "white"),  # Upper legs
+    (0.15, "yellow"),  # Knees
+    (0.06, "white"),  # Lower legs
+    (0.00, "red"),  # Feet
+)
 
 
 class AnimatedRobot(Entity):
@@ -508,20 +654,25 @@ class AnimatedRobot(Entity):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.animation_files = {
-            "idle": MODELS_PATH / "robot-default.glb",
-            "dance": MODELS_PATH / "robot-dance.glb",
-            "punch_left": MODELS_PATH / "robot-punch-left.glb",
-            "punch_right": MODELS_PATH / "robot-punch-right.glb",
-            "kick_left": MODELS_PATH / "robot-left-kick.glb",
-            "kick_right": MODELS_PATH / "robot-right-kick.glb",
-            "boxing": MODELS_PATH / "robot-boxing.glb",
-        }
+        self.animation_files = ANIMATION_FILES
         self.current_animation = None
         self.current_actor = None
+        self._actors = {}
         self._init_materials()
+        self._load_actors()
         self.set_animation("idle")
 
+    def _load_actors(self):
+        """Load and color every animation once so switching never hits disk."""
+        for name, path in self.animation_files.items():
+            try:
+                actor = Actor(path)
+            except Exception as e:
+                print(f"Error loading animation '{name}': {e}")
+                continue
+            self._actors[name] = actor
+            self._apply_colors(actor)
+
     def _init_materials(self):
         if AnimatedRobot.MATERIALS:
             return
@@ -552,54 +703,36 @@ class AnimatedRobot(Entity):
             ),
         }
 
-    def _apply_colors(self):
-        if not self.current_actor:
-            return
-
+    def _apply_colors(self, actor):
+        """Pick a material for each mesh by its height; runs once per actor at load."""
         mats = AnimatedRobot.MATERIALS
-        # Height zones: 0=feet, 1=head (Z range: 0.1 to 23.5)
-        zones = [
-            (0.92, "yellow"),  # Head top
-            (0.82, "white"),  # Head
-            (0.72, "blue"),  # Chest
-            (0.58, "white"),  # Abdomen
-            (0.45, "gray"),  # Waist
-            (0.22, "white"),  # Upper legs
-            (0.15, "yellow"),  # Knees
-            (0.06, "white"),  # Lower legs
-            (0.00, "red"),  # Feet
-        ]
-
-        for mesh in self.current_actor.findAllMatches("**/+GeomNode"):
+        for mesh in actor.findAllMatches("**/+GeomNode"):
             bounds = mesh.getTightBounds()
             if not bounds:
                 mesh.setMaterial(mats["white"], 1)
                 continue
 
             height_pct = ((bounds[0].z + bounds[1].z) / 2 - 0.1) / 23.4
-            for threshold, mat_name in zones:
+            for threshold, mat_name in MATERIAL_ZONES:
                 if height_pct > threshold:
                     mesh.setMaterial(mats[mat_name], 1)
                     break
 
     def set_animation(self, name: str):
-        if name == self.current_animation or name not in self.animation_files:
+        if name == self.current_animation or name not in self._actors:
             return
 
+        # Inactive actors stay detached so they are neither culled nor animated
         if self.current_actor:
-            self.current_actor.cleanup()
-            self.current_actor.removeNode()
+            self.current_actor.stop()
+            self.current_actor.detachNode()
 
-        try:
-            self.current_actor = Actor(str(self.animation_files[name]))
-            self.current_actor.reparentTo(self)
-            self.current_animation = name
-            anim_names = self.current_actor.getAnimNames()
-            if anim_names:
-                self.current_actor.loop(anim_names[0])
-            self._apply_colors()
-        except Exception as e:
-            print(f"Error loading animation '{name}': {e}")
+        self.current_actor = self._actors[name]
+        self.current_actor.reparentTo(self)
+        self.current_animation = name
+        anim_names = self.current_actor.getAnimNames()
+        if anim_names:
+            self.current_actor.loop(anim_names[0])
 
 
 def main():
@@ -651,6 +784,9 @@ def main():
     )
     webcam_tex.setWrapU(P3DTexture.WM_clamp)
     webcam_tex.setWrapV(P3DTexture.WM_clamp)
+    # Frames are written straight into this RAM image, so the upload path
+    # never allocates
+    webcam_tex.makeRamImage()
 
     panel_height = 0.22
     panel_width = panel_height * (webcam_size[0] / webcam_size[1])
@@ -668,6 +804,13 @@ def main():
         color=color.white,
     )
     webcam_panel.setTexture(webcam_tex)
+    # OpenCV rows run top-down but Panda3D textures run bottom-up; sample with
+    # v = 1 - v once here instead of flipping every frame. Ursina's shaders
+    # read the transform from shader inputs, fixed-function from the stage.
+    webcam_panel.setTexScale(TextureStage.getDefault(), 1, -1)
+    webcam_panel.setTexOffset(TextureStage.getDefault(), 0, 1)
+    webcam_panel.set_shader_input("texture_scale", Vec2(1, -1))
+    webcam_panel.set_shader_input("texture_offset", Vec2(0, 1))
     Entity(
         parent=camera.ui,
         model="quad",
@@ -690,7 +833,9 @@ def main():
         enabled=False,
     )
 
-    gesture_controller = GestureController()
+    gesture_controller = GestureController(
+        pin_threads=os.environ.get("ATOM_PIN_THREADS") == "1"
+    )
     camera_ok = gesture_controller.start()
     if not camera_ok:
         camera_error_text.enabled = True
@@ -732,9 +877,19 @@ def main():
             # Update webcam display
             frame = gesture_controller.get_latest_frame()
             if frame is not None:
-                frame = cv2.resize(frame, webcam_size)
-                frame = cv2.flip(frame, 0)
-                webcam_tex.setRamImage(frame.tobytes())
+                # modifyRamImage also marks the texture for re-upload
+                ram_image = np.frombuffer(
+                    webcam_tex.modifyRamImage(), dtype=np.uint8
+                ).reshape(webcam_size[1], webcam_size[0], 3)
+                if frame.shape[1::-1] != webcam_size:
+                    cv2.resize(
+                        frame,
+                        webcam_size,
+                        dst=ram_image,
+                        interpolation=cv2.INTER_AREA,
+                    )
+                else:
+                    np.copyto(ram_image, frame)
 
             robot.rotation_y += 10 * time.dt
 
@@ -766,6 +921,8 @@ def main():
                     "right_gesture": "none",
                     "confidence": 1.0,
                 }
+                # Let the held gesture take over again once it is detected
+                gesture_controller.republish_gesture()
 
     GameController()
     app.run()
@@ -1,5 +1,7 @@
 """Gesture detection from hand landmarks."""
 
+import numpy as np
+
 
 class GestureDetector:
     """Detects hand gestures from MediaPipe landmarks."""
@@ -10,40 +12,29 @@ class GestureDetector:
     RING_TIP, RING_PIP = 16, 14
     PINKY_TIP, PINKY_PIP = 20, 18
 
-    def is_fist(self, landmarks: list) -> bool:
+    TIP_IDX = np.array([INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+    PIP_IDX = np.array([INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP])
+
+    def is_fist(self, landmarks: np.ndarray) -> bool:
         """Check if all fingers are curled (fist)."""
-        if not landmarks or len(landmarks) < 21:
+        if landmarks is None or len(landmarks) < 21:
             return False
-        return all(
-            landmarks[tip][1] > landmarks[pip][1]
-            for tip, pip in [
-                (self.INDEX_TIP, self.INDEX_PIP),
-                (self.MIDDLE_TIP, self.MIDDLE_PIP),
-                (self.RING_TIP, self.RING_PIP),
-                (self.PINKY_TIP, self.PINKY_PIP),
-            ]
-        )
-
-    def is_open_palm(self, landmarks: list) -> bool:
+        return bool((landmarks[self.TIP_IDX, 1] > landmarks[self.PIP_IDX, 1]).all())
+
+    def is_open_palm(self, landmarks: np.ndarray) -> bool:
         """Check if all fingers are extended (open palm)."""
-        if not landmarks or len(landmarks) < 21:
+        if landmarks is None or len(landmarks) < 21:
             return False
-        return all(
-            landmarks[tip][1] < landmarks[pip][1]
-            for tip, pip in [
-                (self.INDEX_TIP, self.INDEX_PIP),
-                (self.MIDDLE_TIP, self.MIDDLE_PIP),
-                (self.RING_TIP, self.RING_PIP),
-                (self.PINKY_TIP, self.PINKY_PIP),
-            ]
-        )
-
-    def detect_gesture(self, landmarks: list) -> str:
+        return bool((landmarks[self.TIP_IDX, 1] < landmarks[self.PIP_IDX, 1]).all())
+
+    def detect_gesture(self, landmarks: np.ndarray) -> str:
         """Detect gesture: 'fist', 'open', or 'none'."""
-        if not landmarks:
+        if landmarks is None or len(landmarks) < 21:
             return "none"
-        if self.is_fist(landmarks):
+        # Positive where a fingertip sits below its PIP joint (curled)
+        diff = landmarks[self.TIP_IDX, 1] - landmarks[self.PIP_IDX, 1]
+        if diff.min() > 0:
             return "fist"
-        if self.is_open_palm(landmarks):
+        if diff.max() < 0:
             return "open"
         return "none"
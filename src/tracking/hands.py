@@ -2,42 +2,89 @@
 
 import mediapipe as mp
 import cv2
+import numpy as np
+from collections import namedtuple
+
+ColorSet = namedtuple("ColorSet", ["line", "joint", "tip"])
 
 
 class HandTracker:
     """Hand tracking using MediaPipe."""
 
-    CONNECTIONS = [
-        (0, 1), (1, 2), (2, 3), (3, 4),      # Thumb
-        (0, 5), (5, 6), (6, 7), (7, 8),      # Index
-        (0, 9), (9, 10), (10, 11), (11, 12), # Middle
-        (0, 13), (13, 14), (14, 15), (15, 16), # Ring
-        (0, 17), (17, 18), (18, 19), (19, 20), # Pinky
-        (5, 9), (9, 13), (13, 17),           # Palm
+    # Connections drawn as polylines: each finger from the wrist, then the palm
+    CHAINS = [
+        np.array([0, 1, 2, 3, 4]),      # Thumb
+        np.array([0, 5, 6, 7, 8]),      # Index
+        np.array([0, 9, 10, 11, 12]),   # Middle
+        np.array([0, 13, 14, 15, 16]),  # Ring
+        np.array([0, 17, 18, 19, 20]),  # Pinky
+        np.array([5, 9, 13, 17]),       # Palm
     ]
 
-    COLORS = {
-        "Left": {"line": (0, 255, 0), "joint": (0, 200, 0), "tip": (0, 255, 255)},
-        "Right": {"line": (255, 0, 0), "joint": (200, 0, 0), "tip": (255, 0, 255)},
-    }
-
-    def __init__(self, max_hands: int = 1, detection_confidence: float = 0.7):
+    TIP_IDX = (4, 8, 12, 16, 20)
+    JOINT_IDX = (0, 1, 2, 3, 5, 6, 7, 9, 10, 11, 13, 14, 15, 17, 18, 19)
+
+    # Indexed by handedness: 0 = Left, 1 = Right (also used for unknown hands)
+    COLORS = (
+        ColorSet(line=(0, 255, 0), joint=(0, 200, 0), tip=(0, 255, 255)),
+        ColorSet(line=(255, 0, 0), joint=(200, 0, 0), tip=(255, 0, 255)),
+    )
+
+    def __init__(
+        self,
+        max_hands: int = 1,
+        detection_confidence: float = 0.7,
+        infer_width: int = 320,
+        model_complexity: int = 0,
+    ):
+        # Frames wider than infer_width are downscaled before inference;
+        # MediaPipe resizes to a few hundred pixels internally, so extra
+        # resolution only costs copies
+        self.infer_width = infer_width
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=max_hands,
+            model_complexity=model_complexity,
             min_detection_confidence=detection_confidence,
             min_tracking_confidence=0.5,
         )
+        # Reused resize and RGB buffers for MediaPipe input, sized on first use
+        self._small = None
+        self._rgb = None
+        # Reused landmark projection buffers for draw_landmarks
+        self._scaled = np.empty((max_hands, 21, 2), dtype=np.float32)
+        self._pixels = np.empty((max_hands, 21, 2), dtype=np.int32)
 
     def process_frame(self, frame):
-        return self.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        """Run MediaPipe on a BGR frame, returning (results, landmark array)."""
+        h, w = frame.shape[:2]
+        if w > self.infer_width:
+            # Landmarks are normalized, so callers can keep using the full frame
+            size = (self.infer_width, round(h * self.infer_width / w))
+            if self._small is None or self._small.shape[1::-1] != size:
+                self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            frame = cv2.resize(frame, size, dst=self._small,
+                               interpolation=cv2.INTER_AREA)
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty(frame.shape, dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        results = self.hands.process(self._rgb)
+        return results, self.get_landmarks(results)
 
     def get_landmarks(self, results):
+        """Return landmarks as an (n_hands, 21, 3) float32 array."""
         if not results.multi_hand_landmarks:
-            return []
-        return [[(lm.x, lm.y, lm.z) for lm in hand.landmark]
-                for hand in results.multi_hand_landmarks]
+            return np.empty((0, 21, 3), dtype=np.float32)
+        hands = results.multi_hand_landmarks
+        # Stream coordinates straight into one buffer instead of building
+        # nested lists of per-landmark tuples
+        coords = np.fromiter(
+            (c for hand in hands for lm in hand.landmark for c in (lm.x, lm.y, lm.z)),
+            dtype=np.float32,
+            count=len(hands) * 21 * 3,
+        )
+        return coords.reshape(len(hands), 21, 3)
 
     def get_handedness(self, results):
         if not results.multi_handedness:
@@ -47,28 +94,36 @@ class HandTracker:
     def close(self):
         self.hands.close()
 
-    def draw_landmarks(self, frame, results):
+    def draw_landmarks(self, frame, results, landmarks=None):
         if not results.multi_hand_landmarks:
             return frame
+        if landmarks is None:
+            landmarks = self.get_landmarks(results)
 
         h, w = frame.shape[:2]
         handedness = self.get_handedness(results)
-
-        for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
+        # Project every hand to pixel coordinates in one broadcast
+        n_hands = len(landmarks)
+        scaled = np.multiply(landmarks[:, :, :2], (w, h), out=self._scaled[:n_hands])
+        np.rint(scaled, out=scaled)
+        pixels = self._pixels[:n_hands]
+        np.copyto(pixels, scaled, casting="unsafe")
+
+        for idx, hand_pixels in enumerate(pixels):
             label = handedness[idx] if idx < len(handedness) else "Right"
-            colors = self.COLORS.get(label, self.COLORS["Right"])
+            colors = self.COLORS[0 if label == "Left" else 1]
 
-            points = [(int(lm.x * w), int(lm.y * h)) for lm in hand_landmarks.landmark]
+            cv2.polylines(frame, [hand_pixels[chain] for chain in self.CHAINS],
+                          False, colors.line, 2)
 
-            for start, end in self.CONNECTIONS:
-                cv2.line(frame, points[start], points[end], colors["line"], 2)
+            points = [tuple(point) for point in hand_pixels.tolist()]
 
-            for i, point in enumerate(points):
-                is_tip = i in [4, 8, 12, 16, 20]
-                cv2.circle(frame, point, 8 if is_tip else 5,
-                          colors["tip"] if is_tip else colors["joint"], -1)
+            for i in self.JOINT_IDX:
+                cv2.circle(frame, points[i], 5, colors.joint, -1)
+            for i in self.TIP_IDX:
+                cv2.circle(frame, points[i], 8, colors.tip, -1)
 
             cv2.putText(frame, label, (points[0][0] - 30, points[0][1] + 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, colors["line"], 2)
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, colors.line, 2)
 
         return frame